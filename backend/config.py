@@ -3,7 +3,9 @@ E-Commerce Dashboard Configuration
 Fill in your API credentials for each platform.
 """
 
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
@@ -15,9 +17,9 @@ class Cafe24Config(BaseSettings):
     access_token: Optional[str] = None
     refresh_token: Optional[str] = None
     api_base_url: str = "https://api.cafe24.com/api/v2"
+    requests_per_second: float = 20.0
     
-    class Config:
-        env_prefix = "CAFE24_"
+    model_config = SettingsConfigDict(env_prefix="CAFE24_")
 
 
 class NaverConfig(BaseSettings):
@@ -26,9 +28,9 @@ class NaverConfig(BaseSettings):
     client_secret: Optional[str] = None
     access_token: Optional[str] = None
     api_base_url: str = "https://api.commerce.naver.com/external/v1"
+    requests_per_second: float = 10.0
     
-    class Config:
-        env_prefix = "NAVER_"
+    model_config = SettingsConfigDict(env_prefix="NAVER_")
 
 
 class CoupangConfig(BaseSettings):
@@ -37,9 +39,9 @@ class CoupangConfig(BaseSettings):
     access_key: Optional[str] = None
     secret_key: Optional[str] = None
     api_base_url: str = "https://api-gateway.coupang.com/v2/providers/openapi/apis"
+    requests_per_second: float = 10.0
     
-    class Config:
-        env_prefix = "COUPANG_"
+    model_config = SettingsConfigDict(env_prefix="COUPANG_")
 
 
 class AppConfig(BaseSettings):
@@ -49,12 +51,17 @@ class AppConfig(BaseSettings):
     cors_origins: list = ["*"]
     use_mock_data: bool = True  # Set to False when API integrations are ready
     
-    cafe24: Cafe24Config = Cafe24Config()
-    naver: NaverConfig = NaverConfig()
-    coupang: CoupangConfig = CoupangConfig()
+    cafe24: Cafe24Config = Field(default_factory=Cafe24Config)
+    naver: NaverConfig = Field(default_factory=NaverConfig)
+    coupang: CoupangConfig = Field(default_factory=CoupangConfig)
     
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
 
 
-config = AppConfig()
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Load settings once per process"""
+    return AppConfig()
+
+
+config = get_config()
@@ -1,6 +1,64 @@
 # Platform Integrations
-from .cafe24 import Cafe24Client
-from .naver import NaverClient
-from .coupang import CoupangClient
+import asyncio
+import logging
+from datetime import datetime
+from typing import Iterable, List, Tuple
 
-__all__ = ["Cafe24Client", "NaverClient", "CoupangClient"]
+from models import Channel, Order
+
+from .base import PlatformClient
+from .ratelimit import AsyncTokenBucket
+from .retry import with_retries
+from .transport import SHARED_TRANSPORT, create_transport
+from .cafe24 import Cafe24Client, cafe24_client
+from .naver import NaverClient, naver_client
+from .coupang import CoupangClient, coupang_client
+
+logger = logging.getLogger(__name__)
+
+_CLIENTS_BY_CHANNEL = {
+    Channel.CAFE24: cafe24_client,
+    Channel.NAVER: naver_client,
+    Channel.COUPANG: coupang_client,
+}
+
+
+async def fetch_all_orders(
+    start_date: datetime = None,
+    end_date: datetime = None,
+    status: str = None,
+    limit: int = 100,
+    channels: Iterable[Channel] = None
+) -> Tuple[List[Order], List[Channel]]:
+    """
+    Fetch orders from every platform (or just `channels`) concurrently.
+
+    A failing platform is logged and skipped so the others still return.
+    Returns the orders and the channels that failed, so callers can tell
+    a partial list from a complete one.
+    """
+    channels = tuple(_CLIENTS_BY_CHANNEL if channels is None else channels)
+    clients = tuple(_CLIENTS_BY_CHANNEL[ch] for ch in channels)
+    results = await asyncio.gather(
+        *(client.get_orders(start_date, end_date, status, limit) for client in clients),
+        return_exceptions=True
+    )
+
+    orders = []
+    failed = []
+    for channel, client, result in zip(channels, clients, results):
+        if isinstance(result, BaseException):
+            logger.error(f"{type(client).__name__} get_orders failed: {result}")
+            failed.append(channel)
+            continue
+        orders.extend(result)
+
+    return orders, failed
+
+
+__all__ = [
+    "PlatformClient", "Cafe24Client", "NaverClient", "CoupangClient",
+    "cafe24_client", "naver_client", "coupang_client",
+    "fetch_all_orders", "AsyncTokenBucket", "with_retries",
+    "SHARED_TRANSPORT", "create_transport",
+]
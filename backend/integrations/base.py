@@ -0,0 +1,56 @@
+"""
+Connection handling shared by the platform API clients
+"""
+
+from typing import Optional
+
+import httpx
+
+from .transport import SHARED_TRANSPORT
+
+
+class PlatformClient:
+    """
+    Base for the platform clients
+
+    Subclasses build their AsyncClient around self._transport in
+    get_client() and report credentials through is_configured.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport = transport or SHARED_TRANSPORT
+
+    @property
+    def is_configured(self) -> bool:
+        raise NotImplementedError
+
+    async def get_client(self) -> httpx.AsyncClient:
+        raise NotImplementedError
+
+    async def close(self):
+        # Only drop the client: aclose() would also close the shared
+        # transport, which is owned by the application
+        self._client = None
+
+    def use_transport(self, transport: httpx.AsyncBaseTransport):
+        """Route future requests through the given connection pool"""
+        self._transport = transport
+        self._client = None
+
+    async def prewarm(self):
+        """Open a pooled connection ahead of the first real request"""
+        if not self.is_configured:
+            return
+        client = await self.get_client()
+        try:
+            await client.head("/")
+        except httpx.HTTPError:
+            pass
+
+    async def __aenter__(self):
+        await self.get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -3,18 +3,38 @@ Cafe24 API Integration
 Documentation: https://developers.cafe24.com/docs/api/
 """
 
+import asyncio
 import httpx
-from typing import List, Optional
+import orjson
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 from datetime import datetime
 import logging
+import sys
 
-from config import config
-from models import Order, InventoryItem, ShippingInfo, Channel
+from config import get_config
+from models import Order, OrderItem, OrderStatus, InventoryItem, ShippingInfo, Channel
+from .base import PlatformClient
+from .ratelimit import AsyncTokenBucket
+from .retry import with_retries
+from .streaming import iter_json_items
+from .timestamps import KST, parse_iso
 
+config = get_config()
 logger = logging.getLogger(__name__)
 
+# Map Cafe24 status codes to our status enum
+_CAFE24_STATUS_MAP: Mapping[str, OrderStatus] = MappingProxyType({
+    "N00": OrderStatus.PENDING,
+    "N10": OrderStatus.CONFIRMED,
+    "N20": OrderStatus.PROCESSING,
+    "N30": OrderStatus.SHIPPED,
+    "N40": OrderStatus.DELIVERED,
+    "C00": OrderStatus.CANCELLED
+})
 
-class Cafe24Client:
+
+class Cafe24Client(PlatformClient):
     """
     Cafe24 API Client
     
@@ -24,15 +44,19 @@ class Cafe24Client:
     - mall.read_shipping
     """
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.config = config.cafe24
         self.base_url = self.config.api_base_url
         self.mall_id = self.config.mall_id
-        self._client: Optional[httpx.AsyncClient] = None
+        super().__init__(transport)
+        self._configured = self._check_configured()
+        self._bucket = AsyncTokenBucket(
+            rate=self.config.requests_per_second,
+            capacity=self.config.requests_per_second * 2
+        )
+        self._headers: Optional[dict] = None
     
-    @property
-    def is_configured(self) -> bool:
-        """Check if API credentials are configured"""
+    def _check_configured(self) -> bool:
         return all([
             self.config.client_id,
             self.config.client_secret,
@@ -41,26 +65,32 @@ class Cafe24Client:
         ])
     
     @property
-    def headers(self) -> dict:
+    def is_configured(self) -> bool:
+        """Check if API credentials are configured"""
+        return self._configured
+    
+    def _build_headers(self) -> dict:
         return {
             "Authorization": f"Bearer {self.config.access_token}",
             "Content-Type": "application/json",
-            "X-Cafe24-Api-Version": "2024-06-01"
+            "X-Cafe24-Api-Version": "2024-06-01",
+            "Accept-Encoding": "br, gzip"
         }
     
     async def get_client(self) -> httpx.AsyncClient:
         if self._client is None:
+            self._headers = self._build_headers()
             self._client = httpx.AsyncClient(
                 base_url=f"{self.base_url}/admin",
-                headers=self.headers,
-                timeout=30.0
+                headers=self._headers,
+                timeout=httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0),
+                transport=self._transport
             )
         return self._client
     
     async def close(self):
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await super().close()
+        self._headers = None
     
     # ─────────────────────────────────────────────────────────
     # Orders API
@@ -82,10 +112,14 @@ class Cafe24Client:
             start_date: Order start date filter
             end_date: Order end date filter
             status: Order status filter (N=new, P=processing, etc.)
-            limit: Max orders to fetch
+            limit: Page size; every page up to total_count is fetched
         
         Returns:
             List of Order objects
+        
+        Raises:
+            httpx.HTTPError: the platform API failed; fetch_all_orders
+            reports it rather than passing on a partial list
         """
         if not self.is_configured:
             logger.warning("Cafe24 API not configured")
@@ -101,57 +135,77 @@ class Cafe24Client:
         if status:
             params["order_status"] = status
         
-        try:
-            response = await client.get(f"/orders", params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            orders = []
-            for order_data in data.get("orders", []):
-                # Transform Cafe24 order format to our Order model
-                order = self._transform_order(order_data)
-                orders.append(order)
+        # The first page is parsed whole for its total_count
+        data = await self._fetch_orders_page(client, params)
+        
+        # Transform Cafe24 order format to our Order model
+        orders = [self._transform_order(order_data) for order_data in data.get("orders", [])]
+        
+        # Stream the remaining pages concurrently, a few at a time
+        total = data.get("total_count") or 0
+        if total > limit:
+            sem = asyncio.Semaphore(8)
             
-            return orders
+            async def fetch_page(offset: int) -> List[Order]:
+                async with sem:
+                    return await self._stream_orders_page(client, {**params, "offset": offset})
             
-        except httpx.HTTPError as e:
-            logger.error(f"Cafe24 API error: {e}")
-            return []
+            for page in await asyncio.gather(*(fetch_page(o) for o in range(limit, total, limit))):
+                orders.extend(page)
+        
+        return orders
+    
+    async def _fetch_orders_page(self, client: httpx.AsyncClient, params: dict) -> dict:
+        """GET one page of orders, retrying transient network errors"""
+        async def get_page():
+            async with self._bucket:
+                return await client.get("/orders", params=params)
+        
+        response = await with_retries("Cafe24 API", get_page)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def _stream_orders_page(self, client: httpx.AsyncClient, params: dict) -> List[Order]:
+        """GET one page of orders, transforming each as it comes off the wire"""
+        async def stream_page():
+            async with self._bucket:
+                async with client.stream("GET", "/orders", params=params) as response:
+                    response.raise_for_status()
+                    return [
+                        self._transform_order(order_data)
+                        async for order_data in iter_json_items(response, "orders.item")
+                    ]
+        
+        return await with_retries("Cafe24 API", stream_page)
     
     def _transform_order(self, data: dict) -> Order:
         """Transform Cafe24 order data to Order model"""
-        # Map Cafe24 status codes to our status enum
-        status_map = {
-            "N00": "pending",
-            "N10": "confirmed",
-            "N20": "processing",
-            "N30": "shipped",
-            "N40": "delivered",
-            "C00": "cancelled"
-        }
+        # Product and payment names repeat across orders; interning lets
+        # cached order lists share one copy of each
+        items = [
+            OrderItem.model_construct(
+                product_id=str(item.get("product_no")),
+                product_name=sys.intern(item.get("product_name") or ""),
+                variant=item.get("option_value"),
+                quantity=(qty := item.get("quantity", 1)),
+                unit_price=(price := int(item.get("product_price", 0))),
+                total_price=price * qty
+            )
+            for item in data.get("items", [])
+        ]
         
-        items = []
-        for item in data.get("items", []):
-            items.append({
-                "product_id": item.get("product_no"),
-                "product_name": item.get("product_name"),
-                "variant": item.get("option_value"),
-                "quantity": item.get("quantity", 1),
-                "unit_price": int(item.get("product_price", 0)),
-                "total_price": int(item.get("product_price", 0)) * item.get("quantity", 1)
-            })
-        
-        return Order(
+        # Fields are already typed above, so skip pydantic validation
+        return Order.model_construct(
             order_id=data.get("order_id"),
             channel=Channel.CAFE24,
-            status=status_map.get(data.get("order_status"), "pending"),
+            status=_CAFE24_STATUS_MAP.get(data.get("order_status"), OrderStatus.PENDING),
             customer_name=data.get("buyer_name", ""),
             customer_phone=data.get("buyer_phone"),
             items=items,
             total_amount=int(data.get("total_price", 0)),
             shipping_fee=int(data.get("shipping_fee", 0)),
-            payment_method=data.get("payment_method_name", ""),
-            ordered_at=datetime.fromisoformat(data.get("order_date", datetime.now().isoformat())),
+            payment_method=sys.intern(data.get("payment_method_name") or ""),
+            ordered_at=parse_iso(ts) if (ts := data.get("order_date")) else datetime.now(KST),
             shipping_address=data.get("shipping_address")
         )
     
@@ -3,21 +3,47 @@ Coupang Wing (Open API) Integration
 Documentation: https://developers.coupang.com/
 """
 
+import functools
 import httpx
+import orjson
 import hashlib
 import hmac
 import time
-from typing import List, Optional
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 from datetime import datetime
 import logging
+import sys
 
-from config import config
-from models import Order, InventoryItem, ShippingInfo, Channel
+from config import get_config
+from models import Order, OrderItem, OrderStatus, InventoryItem, ShippingInfo, Channel
+from .base import PlatformClient
+from .ratelimit import AsyncTokenBucket
+from .retry import with_retries
+from .timestamps import KST, parse_iso
 
+config = get_config()
 logger = logging.getLogger(__name__)
 
+# Map Coupang status codes to our status enum
+_COUPANG_STATUS_MAP: Mapping[str, OrderStatus] = MappingProxyType({
+    "ACCEPT": OrderStatus.CONFIRMED,
+    "INSTRUCT": OrderStatus.PROCESSING,
+    "DEPARTURE": OrderStatus.SHIPPED,
+    "DELIVERING": OrderStatus.SHIPPED,
+    "FINAL_DELIVERY": OrderStatus.DELIVERED,
+    "CANCEL": OrderStatus.CANCELLED,
+    "RETURN": OrderStatus.RETURNED
+})
 
-class CoupangClient:
+
+@functools.lru_cache(maxsize=64)
+def _method_path_bytes(method: str, path: str) -> bytes:
+    """Signed-message tail; polling repeats the same few endpoints"""
+    return (method + path).encode('utf-8')
+
+
+class CoupangClient(PlatformClient):
     """
     Coupang Wing API Client
     
@@ -28,65 +54,74 @@ class CoupangClient:
     - 출고/배송 API
     """
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.config = config.coupang
         self.base_url = self.config.api_base_url
-        self._client: Optional[httpx.AsyncClient] = None
+        super().__init__(transport)
+        self._configured = self._check_configured()
+        self._bucket = AsyncTokenBucket(
+            rate=self.config.requests_per_second,
+            capacity=self.config.requests_per_second * 2
+        )
+        self._secret_key_bytes: Optional[bytes] = None
+        self._hmac_template = None
+        # Static parts of the signed request headers
+        self._auth_prefix = f"CEA algorithm=HmacSHA256, access-key={self.config.access_key}, "
+        self._base_headers = {
+            "Content-Type": "application/json;charset=UTF-8",
+            "X-Coupang-Vendor-Id": self.config.vendor_id
+        }
     
-    @property
-    def is_configured(self) -> bool:
-        """Check if API credentials are configured"""
+    def _check_configured(self) -> bool:
         return all([
             self.config.vendor_id,
             self.config.access_key,
             self.config.secret_key
         ])
     
+    @property
+    def is_configured(self) -> bool:
+        """Check if API credentials are configured"""
+        return self._configured
+    
+    def _get_hmac_template(self):
+        """Keyed HMAC state, copied per signature to skip key setup"""
+        if self._hmac_template is None:
+            self._secret_key_bytes = self.config.secret_key.encode('utf-8')
+            self._hmac_template = hmac.new(self._secret_key_bytes, None, hashlib.sha256)
+        return self._hmac_template
+    
     def _generate_signature(self, method: str, path: str, timestamp: str) -> str:
         """
         Generate HMAC-SHA256 signature for Coupang API
         
         Format: HMAC-SHA256(secretKey, datetime + method + path + query)
         """
-        message = timestamp + method + path
-        signature = hmac.new(
-            self.config.secret_key.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        h = self._get_hmac_template().copy()
+        h.update(timestamp.encode('utf-8'))
+        h.update(_method_path_bytes(method, path))
+        return h.hexdigest()
     
     def _get_auth_header(self, method: str, path: str) -> dict:
         """Generate authorization header with signature"""
-        timestamp = datetime.utcnow().strftime('%y%m%dT%H%M%SZ')
+        timestamp = time.strftime('%y%m%dT%H%M%SZ', time.gmtime())
         signature = self._generate_signature(method, path, timestamp)
         
-        authorization = (
-            f"CEA algorithm=HmacSHA256, "
-            f"access-key={self.config.access_key}, "
-            f"signed-date={timestamp}, "
-            f"signature={signature}"
-        )
-        
         return {
-            "Authorization": authorization,
-            "Content-Type": "application/json;charset=UTF-8",
-            "X-Coupang-Vendor-Id": self.config.vendor_id
-        }
+            "Authorization": f"{self._auth_prefix}signed-date={timestamp}, signature={signature}"
+        } | self._base_headers
     
     async def get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                timeout=30.0
+                # Coupang compresses with gzip only
+                headers={"Accept-Encoding": "gzip"},
+                timeout=httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0),
+                transport=self._transport
             )
         return self._client
     
-    async def close(self):
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-    
     # ─────────────────────────────────────────────────────────
     # Orders API
     # ─────────────────────────────────────────────────────────
@@ -107,10 +142,14 @@ class CoupangClient:
             start_date: Created after this date
             end_date: Created before this date
             status: Order status (ACCEPT, INSTRUCT, etc.)
-            limit: Max orders per page
+            limit: Max orders per page; every page is followed via nextToken
         
         Returns:
             List of Order objects
+        
+        Raises:
+            httpx.HTTPError: the platform API failed; fetch_all_orders
+            reports it rather than passing on a partial list
         """
         if not self.is_configured:
             logger.warning("Coupang API not configured")
@@ -132,60 +171,65 @@ class CoupangClient:
         
         client = await self.get_client()
         
-        try:
-            response = await client.get(
-                path,
-                params=params,
-                headers=self._get_auth_header("GET", path)
+        data = await self._fetch_ordersheets_page(client, path, params)
+        pages = [data.get("data", [])]
+        
+        # Cursor pagination: each page names the next, so fetch in order
+        next_token = data.get("nextToken")
+        while next_token:
+            data = await self._fetch_ordersheets_page(
+                client, path, {**params, "nextToken": next_token}
             )
-            response.raise_for_status()
-            data = response.json()
-            
-            orders = []
-            for order_data in data.get("data", []):
-                order = self._transform_order(order_data)
-                orders.append(order)
-            
-            return orders
-            
-        except httpx.HTTPError as e:
-            logger.error(f"Coupang API error: {e}")
-            return []
+            pages.append(data.get("data", []))
+            next_token = data.get("nextToken")
+        
+        return [self._transform_order(order_data) for page in pages for order_data in page]
+    
+    async def _fetch_ordersheets_page(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        params: dict
+    ) -> dict:
+        """GET one page of order sheets, retrying transient network errors"""
+        async def get_page():
+            # Signed per attempt so the signed-date stays fresh
+            async with self._bucket:
+                return await client.get(
+                    path,
+                    params=params,
+                    headers=self._get_auth_header("GET", path)
+                )
+        
+        response = await with_retries("Coupang API", get_page)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     def _transform_order(self, data: dict) -> Order:
         """Transform Coupang order data to Order model"""
-        status_map = {
-            "ACCEPT": "confirmed",
-            "INSTRUCT": "processing",
-            "DEPARTURE": "shipped",
-            "DELIVERING": "shipped",
-            "FINAL_DELIVERY": "delivered",
-            "CANCEL": "cancelled",
-            "RETURN": "returned"
-        }
-        
-        items = []
-        for item in data.get("orderItems", []):
-            items.append({
-                "product_id": str(item.get("vendorItemId")),
-                "product_name": item.get("vendorItemName", ""),
-                "variant": item.get("optionName"),
-                "quantity": item.get("shippingCount", 1),
-                "unit_price": int(item.get("orderPrice", 0)),
-                "total_price": int(item.get("orderPrice", 0)) * item.get("shippingCount", 1)
-            })
+        items = [
+            OrderItem.model_construct(
+                product_id=str(item.get("vendorItemId")),
+                product_name=sys.intern(item.get("vendorItemName") or ""),
+                variant=item.get("optionName"),
+                quantity=(qty := item.get("shippingCount", 1)),
+                unit_price=(price := int(item.get("orderPrice", 0))),
+                total_price=price * qty
+            )
+            for item in data.get("orderItems", [])
+        ]
         
-        return Order(
+        return Order.model_construct(
             order_id=str(data.get("orderId")),
             channel=Channel.COUPANG,
-            status=status_map.get(data.get("status"), "pending"),
+            status=_COUPANG_STATUS_MAP.get(data.get("status"), OrderStatus.PENDING),
             customer_name=data.get("receiver", {}).get("name", ""),
             customer_phone=data.get("receiver", {}).get("phone"),
             items=items,
             total_amount=int(data.get("totalPrice", 0)),
             shipping_fee=int(data.get("shippingPrice", 0)),
-            payment_method=data.get("paymentMethod", ""),
-            ordered_at=datetime.fromisoformat(data.get("orderedAt", datetime.now().isoformat())),
+            payment_method=sys.intern(data.get("paymentMethod") or ""),
+            ordered_at=parse_iso(ts) if (ts := data.get("orderedAt")) else datetime.now(KST),
             shipping_address=data.get("receiver", {}).get("address")
         )
     
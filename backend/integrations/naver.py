@@ -3,22 +3,49 @@ Naver SmartStore API Integration
 Documentation: https://apicenter.commerce.naver.com/
 """
 
+import asyncio
+import functools
 import httpx
+import orjson
 import hashlib
+import math
 import hmac
 import base64
 import time
-from typing import List, Optional
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 from datetime import datetime
 import logging
+import sys
 
-from config import config
-from models import Order, InventoryItem, ShippingInfo, Channel
+from config import get_config
+from models import Order, OrderItem, OrderStatus, InventoryItem, ShippingInfo, Channel
+from .base import PlatformClient
+from .ratelimit import AsyncTokenBucket
+from .retry import with_retries
+from .streaming import iter_json_items
+from .timestamps import KST, parse_iso
 
+config = get_config()
 logger = logging.getLogger(__name__)
 
+# Map Naver status codes to our status enum
+_NAVER_STATUS_MAP: Mapping[str, OrderStatus] = MappingProxyType({
+    "PAYED": OrderStatus.CONFIRMED,
+    "DELIVERING": OrderStatus.SHIPPED,
+    "DELIVERED": OrderStatus.DELIVERED,
+    "CANCELED": OrderStatus.CANCELLED,
+    "EXCHANGED": OrderStatus.RETURNED
+})
 
-class NaverClient:
+
+@functools.lru_cache(maxsize=64)
+def _method_uri_bytes(method: str, uri: str) -> bytes:
+    """Signed-message tail after the timestamp"""
+    return f".{method}.{uri}".encode('utf-8')
+
+
+class NaverClient(PlatformClient):
     """
     Naver SmartStore (Commerce) API Client
     
@@ -29,53 +56,71 @@ class NaverClient:
     - 발주발송
     """
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.config = config.naver
         self.base_url = self.config.api_base_url
-        self._client: Optional[httpx.AsyncClient] = None
+        super().__init__(transport)
+        self._configured = self._check_configured()
+        self._bucket = AsyncTokenBucket(
+            rate=self.config.requests_per_second,
+            capacity=self.config.requests_per_second * 2
+        )
+        self._headers: Optional[dict] = None
+        self._secret_key_bytes: Optional[bytes] = None
+        self._hmac_template = None
         self._token_expires_at: int = 0
     
-    @property
-    def is_configured(self) -> bool:
-        """Check if API credentials are configured"""
+    def _check_configured(self) -> bool:
         return all([
             self.config.client_id,
             self.config.client_secret
         ])
     
+    @property
+    def is_configured(self) -> bool:
+        """Check if API credentials are configured"""
+        return self._configured
+    
+    def _get_hmac_template(self):
+        """Keyed HMAC state, copied per signature to skip key setup"""
+        if self._hmac_template is None:
+            self._secret_key_bytes = self.config.client_secret.encode('utf-8')
+            self._hmac_template = hmac.new(self._secret_key_bytes, None, hashlib.sha256)
+        return self._hmac_template
+    
     def _generate_signature(self, timestamp: str, method: str, uri: str) -> str:
         """Generate HMAC signature for Naver API"""
-        message = f"{timestamp}.{method}.{uri}"
-        signature = hmac.new(
-            self.config.client_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).digest()
-        return base64.b64encode(signature).decode('utf-8')
+        h = self._get_hmac_template().copy()
+        h.update(timestamp.encode('utf-8'))
+        h.update(_method_uri_bytes(method, uri))
+        return base64.b64encode(h.digest()).decode('utf-8')
     
-    @property
-    def headers(self) -> dict:
-        timestamp = str(int(time.time() * 1000))
+    def _build_headers(self) -> dict:
         return {
             "Authorization": f"Bearer {self.config.access_token}",
             "Content-Type": "application/json",
             "X-Naver-Client-Id": self.config.client_id,
-            "X-Naver-Timestamp": timestamp
+            "Accept-Encoding": "br, gzip"
         }
     
+    def _timestamp_header(self) -> dict:
+        """Per-request timestamp header for signed endpoints"""
+        return {"X-Naver-Timestamp": str(time.time_ns() // 1_000_000)}
+    
     async def get_client(self) -> httpx.AsyncClient:
         if self._client is None:
+            self._headers = self._build_headers()
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
-                headers=self.headers,
-                timeout=30.0
+                headers=self._headers,
+                timeout=httpx.Timeout(connect=3.0, read=10.0, write=5.0, pool=2.0),
+                transport=self._transport
             )
         return self._client
     
     async def close(self):
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await super().close()
+        self._headers = None
     
     async def refresh_token(self) -> bool:
         """
@@ -102,6 +147,11 @@ class NaverClient:
                 self.config.access_token = data.get("access_token")
                 self._token_expires_at = time.time() + data.get("expires_in", 3600)
                 
+                self._configured = self._check_configured()
+                
+                # Rebuild the pooled client with the new bearer token
+                await self.close()
+                
                 return True
             except httpx.HTTPError as e:
                 logger.error(f"Naver token refresh failed: {e}")
@@ -127,10 +177,14 @@ class NaverClient:
             start_date: Order start date
             end_date: Order end date
             status: Order status (PAYED, DELIVERING, DELIVERED, etc.)
-            limit: Max orders
+            limit: Page size; every page up to totalElements is fetched
         
         Returns:
             List of Order objects
+        
+        Raises:
+            httpx.HTTPError: the platform API failed; fetch_all_orders
+            reports it rather than passing on a partial list
         """
         if not self.is_configured:
             logger.warning("Naver API not configured")
@@ -140,6 +194,7 @@ class NaverClient:
         
         # Naver uses POST with JSON body for order search
         payload = {
+            "page": 1,
             "pageSize": limit
         }
         
@@ -150,58 +205,83 @@ class NaverClient:
         if status:
             payload["orderStatus"] = status
         
-        try:
-            response = await client.post(
-                "/pay-order/seller/orders/search",
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            orders = []
-            for order_data in data.get("data", {}).get("contents", []):
-                order = self._transform_order(order_data)
-                orders.append(order)
+        # The first page is parsed whole for its totalElements
+        data = (await self._search_orders_page(client, payload)).get("data", {})
+        orders = [self._transform_order(order_data) for order_data in data.get("contents", [])]
+        
+        # Stream the remaining pages concurrently, a few at a time
+        total = data.get("totalElements") or 0
+        page_size = data.get("pageSize") or limit
+        if total > page_size:
+            sem = asyncio.Semaphore(8)
             
-            return orders
+            async def fetch_page(page: int) -> List[Order]:
+                async with sem:
+                    return await self._stream_search_page(client, {**payload, "page": page})
             
-        except httpx.HTTPError as e:
-            logger.error(f"Naver API error: {e}")
-            return []
+            last_page = math.ceil(total / page_size)
+            for page in await asyncio.gather(*(fetch_page(p) for p in range(2, last_page + 1))):
+                orders.extend(page)
+        
+        return orders
+    
+    async def _search_orders_page(self, client: httpx.AsyncClient, payload: dict) -> dict:
+        """POST one order search page, retrying transient network errors"""
+        async def search_page():
+            async with self._bucket:
+                return await client.post(
+                    "/pay-order/seller/orders/search",
+                    content=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json", **self._timestamp_header()}
+                )
+        
+        response = await with_retries("Naver API", search_page)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def _stream_search_page(self, client: httpx.AsyncClient, payload: dict) -> List[Order]:
+        """POST one order search page, transforming each order as it is parsed"""
+        async def stream_page():
+            async with self._bucket:
+                async with client.stream(
+                    "POST",
+                    "/pay-order/seller/orders/search",
+                    content=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json", **self._timestamp_header()}
+                ) as response:
+                    response.raise_for_status()
+                    return [
+                        self._transform_order(order_data)
+                        async for order_data in iter_json_items(response, "data.contents.item")
+                    ]
+        
+        return await with_retries("Naver API", stream_page)
     
     def _transform_order(self, data: dict) -> Order:
         """Transform Naver order data to Order model"""
-        status_map = {
-            "PAYED": "confirmed",
-            "DELIVERING": "shipped",
-            "DELIVERED": "delivered",
-            "CANCELED": "cancelled",
-            "EXCHANGED": "returned"
-        }
-        
-        product_orders = data.get("productOrders", [])
-        items = []
-        for po in product_orders:
-            items.append({
-                "product_id": po.get("productId"),
-                "product_name": po.get("productName", ""),
-                "variant": po.get("optionContent"),
-                "quantity": po.get("quantity", 1),
-                "unit_price": int(po.get("unitPrice", 0)),
-                "total_price": int(po.get("totalPaymentAmount", 0))
-            })
+        items = [
+            OrderItem.model_construct(
+                product_id=po.get("productId"),
+                product_name=sys.intern(po.get("productName") or ""),
+                variant=po.get("optionContent"),
+                quantity=po.get("quantity", 1),
+                unit_price=int(po.get("unitPrice", 0)),
+                total_price=int(po.get("totalPaymentAmount", 0))
+            )
+            for po in data.get("productOrders", [])
+        ]
         
-        return Order(
+        return Order.model_construct(
             order_id=data.get("orderId"),
             channel=Channel.NAVER,
-            status=status_map.get(data.get("orderStatus"), "pending"),
+            status=_NAVER_STATUS_MAP.get(data.get("orderStatus"), OrderStatus.PENDING),
             customer_name=data.get("ordererName", ""),
             customer_phone=data.get("ordererTel"),
             items=items,
             total_amount=int(data.get("totalPaymentAmount", 0)),
             shipping_fee=int(data.get("deliveryFeeAmount", 0)),
-            payment_method=data.get("paymentMethod", ""),
-            ordered_at=datetime.fromisoformat(data.get("orderDate", datetime.now().isoformat()).replace("Z", "+00:00")),
+            payment_method=sys.intern(data.get("paymentMethod") or ""),
+            ordered_at=parse_iso(ts) if (ts := data.get("orderDate")) else datetime.now(KST),
             shipping_address=data.get("shippingAddress")
         )
     
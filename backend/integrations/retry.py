@@ -0,0 +1,37 @@
+"""
+Retries for transient platform API failures
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ATTEMPTS = 3
+BACKOFF_BASE = 0.2  # seconds; doubles after each failed attempt
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ReadTimeout)
+
+
+async def with_retries(label: str, fn: Callable[[], Awaitable[T]]) -> T:
+    """
+    Await fn(), retrying transient network errors with exponential backoff
+
+    fn is called afresh on every attempt, so anything it builds (signed
+    headers, timestamps) stays current. The last error is re-raised.
+
+    Usage:
+        response = await with_retries("Cafe24 API", lambda: client.get(path))
+    """
+    for attempt in range(ATTEMPTS):
+        try:
+            return await fn()
+        except RETRYABLE_ERRORS as e:
+            if attempt == ATTEMPTS - 1:
+                raise
+            logger.warning(f"{label} attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
@@ -0,0 +1,26 @@
+"""
+Incremental JSON parsing of streamed API responses
+"""
+
+from typing import Any, AsyncIterator
+
+import httpx
+import ijson
+
+
+class AsyncByteReader:
+    """Async file-like view over a streamed httpx response, as ijson expects"""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
+def iter_json_items(response: httpx.Response, prefix: str) -> AsyncIterator[Any]:
+    """Yield each element under `prefix` as soon as it has been parsed"""
+    return ijson.items(AsyncByteReader(response), prefix, use_float=True)
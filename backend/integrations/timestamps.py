@@ -0,0 +1,20 @@
+"""
+Timestamp parsing shared by the platform clients
+"""
+
+import functools
+from datetime import datetime, timedelta, timezone
+
+# Platforms that omit an offset (Coupang) report Korea time
+KST = timezone(timedelta(hours=9), "KST")
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_iso(s: str) -> datetime:
+    """
+    Parse an ISO-8601 timestamp; orders on a page often share one
+
+    Always timezone-aware, so orders from different platforms compare.
+    """
+    parsed = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=KST)
@@ -0,0 +1,27 @@
+"""
+Connection pool shared by all platform API clients
+"""
+
+import httpx
+
+
+def create_transport() -> httpx.AsyncHTTPTransport:
+    """
+    Build a keep-alive HTTP/2 pool for the platform clients
+
+    Each client still sets its own base URL, headers and timeouts on a
+    lightweight AsyncClient around the pool.
+    """
+    return httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(
+            max_connections=1000,
+            max_keepalive_connections=100,
+            keepalive_expiry=30.0
+        )
+    )
+
+
+# Default pool for clients used outside the FastAPI app (scripts, shell)
+SHARED_TRANSPORT = create_transport()
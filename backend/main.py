@@ -5,13 +5,23 @@ Supports: Cafe24, Naver SmartStore, Coupang
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from contextlib import asynccontextmanager
-from typing import Optional, List
+from typing import Any, Optional, List, Tuple
 from datetime import datetime, timedelta
+import asyncio
+import heapq
 import logging
+import mmap
 import os
+import time
+from operator import attrgetter
+from pathlib import Path
+
+import orjson
+from cachetools import TTLCache
 
 from config import config
 from models import (
@@ -19,7 +29,11 @@ from models import (
     Order, InventoryItem, ShippingInfo, DashboardData
 )
 from mock_data import mock_service
-from integrations import Cafe24Client, NaverClient, CoupangClient
+from integrations import (
+    Cafe24Client, NaverClient, CoupangClient,
+    cafe24_client, naver_client, coupang_client,
+    create_transport, fetch_all_orders
+)
 
 # ─────────────────────────────────────────────────────────────
 # Logging Setup
@@ -32,6 +46,84 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ─────────────────────────────────────────────────────────────
+# Paths
+# ─────────────────────────────────────────────────────────────
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR.parent / "data"
+COMBINED_PATH = DATA_DIR / "combined" / "latest.json"
+COLLECTOR_SCRIPT = DATA_DIR / "collect.py"
+FRONTEND_DIR = BASE_DIR.parent / "frontend"
+FRONTEND_INDEX = FRONTEND_DIR / "index.html"
+FRONTEND_INDEX_EXISTS = FRONTEND_INDEX.is_file()
+
+# Let browsers reuse the SPA shell briefly; FileResponse adds ETag/Last-Modified
+FRONTEND_CACHE_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+
+# ─────────────────────────────────────────────────────────────
+# JSON Responses
+# ─────────────────────────────────────────────────────────────
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def load_json_file(path: Path) -> Any:
+    """
+    Read and parse a JSON file (blocking; run via asyncio.to_thread)
+
+    The file is memory-mapped so orjson parses straight from the page
+    cache instead of an intermediate bytes copy.
+    """
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view:
+        return orjson.loads(view)
+
+
+# Seconds before the pre-serialized mock dashboard is regenerated
+MOCK_DASHBOARD_TTL = 60.0
+
+
+def build_mock_dashboard_payloads() -> dict:
+    """Serialize the mock dashboard and its analytics sections once"""
+    dashboard = mock_service.get_dashboard_data().model_dump(mode="json")
+    return {
+        "built_at": time.monotonic(),
+        "dashboard": orjson.dumps(dashboard),
+        "weekly_sales": orjson.dumps(dashboard["weekly_sales"]),
+        "channel_breakdown": orjson.dumps(dashboard["channel_breakdown"]),
+    }
+
+
+def build_mock_order_payloads() -> dict:
+    """Serialize every mock order once, keyed by order ID"""
+    return {
+        o.order_id: orjson.dumps(o.model_dump(mode="json"))
+        for o in mock_service.get_orders()
+    }
+
+
+def mock_orders_response(orders: List[Order]) -> Response:
+    """Join the pre-serialized mock orders into a JSON array response"""
+    payloads = app.state.mock_orders
+    content = b"[" + b",".join(payloads[o.order_id] for o in orders) + b"]"
+    return Response(content=content, media_type="application/json")
+
+
+def mock_dashboard_response(section: str) -> Response:
+    """Serve a pre-serialized mock dashboard section, refreshing it after the TTL"""
+    payloads = app.state.mock_dashboard
+    if time.monotonic() - payloads["built_at"] > MOCK_DASHBOARD_TTL:
+        payloads = app.state.mock_dashboard = build_mock_dashboard_payloads()
+    return Response(content=payloads[section], media_type="application/json")
+
+
 # ─────────────────────────────────────────────────────────────
 # App Lifecycle
 # ─────────────────────────────────────────────────────────────
@@ -41,8 +133,26 @@ async def lifespan(app: FastAPI):
     """Application startup and shutdown events"""
     logger.info("🚀 Starting E-Commerce Dashboard API")
     logger.info(f"   Mock Data Mode: {config.use_mock_data}")
+    app.state.mock_dashboard = build_mock_dashboard_payloads()
+    app.state.mock_orders = build_mock_order_payloads()
+    
+    # One connection pool for every platform client, owned by the app
+    app.state.http_transport = create_transport()
+    for client in (cafe24_client, naver_client, coupang_client):
+        client.use_transport(app.state.http_transport)
+    
+    if not config.use_mock_data:
+        await asyncio.gather(
+            cafe24_client.prewarm(),
+            naver_client.prewarm(),
+            coupang_client.prewarm()
+        )
     yield
     # Cleanup
+    await cafe24_client.close()
+    await naver_client.close()
+    await coupang_client.close()
+    await app.state.http_transport.aclose()
     logger.info("👋 Shutting down E-Commerce Dashboard API")
 
 
@@ -54,7 +164,8 @@ app = FastAPI(
     title="E-Commerce Unified Dashboard",
     description="Unified order management for Cafe24, Naver SmartStore, Coupang",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS Middleware
@@ -66,10 +177,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Serve frontend static files
-frontend_path = os.path.join(os.path.dirname(__file__), "..", "frontend")
-if os.path.exists(frontend_path):
-    app.mount("/static", StaticFiles(directory=frontend_path), name="static")
+# Dashboard JSON (repeated keys, Korean text) compresses well
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Serve frontend static files in development; in production the reverse
+# proxy serves /static directly and only forwards /api/* to uvicorn
+if config.debug and FRONTEND_DIR.is_dir():
+    app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
 
 
 # ─────────────────────────────────────────────────────────────
@@ -79,12 +193,15 @@ if os.path.exists(frontend_path):
 @app.get("/")
 async def root():
     """Serve frontend dashboard"""
-    index_path = os.path.join(frontend_path, "index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
+    if FRONTEND_INDEX_EXISTS:
+        return FileResponse(FRONTEND_INDEX, headers=FRONTEND_CACHE_HEADERS)
     return {"message": "E-Commerce Dashboard API", "docs": "/docs"}
 
 
+# (mtime, parsed data) of the last combined/latest.json load
+_dashboard_cache: Optional[Tuple[float, Any]] = None
+
+
 @app.get("/api/dashboard")
 async def get_dashboard():
     """
@@ -95,23 +212,26 @@ async def get_dashboard():
     - Pending shipments
     - Inventory status
     """
-    import json
+    global _dashboard_cache
     
     # Try to load real data from combined JSON
-    data_path = os.path.join(os.path.dirname(__file__), "..", "data", "combined", "latest.json")
-    
-    if os.path.exists(data_path):
+    if COMBINED_PATH.is_file():
         try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                real_data = json.load(f)
-            logger.info(f"Loaded real data from {data_path}")
+            # Reuse the parsed file until the collector rewrites it
+            mtime = COMBINED_PATH.stat().st_mtime
+            if _dashboard_cache is not None and _dashboard_cache[0] == mtime:
+                return _dashboard_cache[1]
+            
+            real_data = await asyncio.to_thread(load_json_file, COMBINED_PATH)
+            _dashboard_cache = (mtime, real_data)
+            logger.info(f"Loaded real data from {COMBINED_PATH}")
             return real_data
         except Exception as e:
             logger.error(f"Failed to load real data: {e}")
     
     # Fallback to mock data
     logger.info("Using mock data (real data not available)")
-    return mock_service.get_dashboard_data()
+    return mock_dashboard_response("dashboard")
 
 
 @app.get("/api/health")
@@ -131,15 +251,6 @@ async def refresh_data():
     Manually trigger data refresh from all platforms.
     Clears cache and reloads data from source files.
     """
-    import json
-    import subprocess
-    
-    data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
-    combined_path = os.path.join(data_dir, "combined", "latest.json")
-    
-    # Check if collector script exists
-    collector_script = os.path.join(data_dir, "collect.py")
-    
     result = {
         "success": True,
         "timestamp": datetime.now().isoformat(),
@@ -148,21 +259,29 @@ async def refresh_data():
     }
     
     # Try to run collector script if exists
-    if os.path.exists(collector_script):
+    if COLLECTOR_SCRIPT.is_file():
         try:
-            subprocess.run(["python", collector_script], 
-                         cwd=data_dir, 
-                         timeout=60,
-                         capture_output=True)
+            # Run the collector without blocking the event loop
+            proc = await asyncio.create_subprocess_exec(
+                "python", str(COLLECTOR_SCRIPT),
+                cwd=DATA_DIR,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                await asyncio.wait_for(proc.communicate(), timeout=60)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise TimeoutError("collector timed out after 60s")
             result["sources"].append({"name": "collector", "status": "executed"})
         except Exception as e:
             result["sources"].append({"name": "collector", "status": f"error: {str(e)}"})
     
     # Verify data file exists and is readable
-    if os.path.exists(combined_path):
+    if COMBINED_PATH.is_file():
         try:
-            with open(combined_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = await asyncio.to_thread(load_json_file, COMBINED_PATH)
             
             # Get data stats
             result["data_stats"] = {
@@ -170,7 +289,7 @@ async def refresh_data():
                 "pending": data.get("summary", {}).get("pending_shipments", 0),
                 "revenue": data.get("summary", {}).get("total_revenue", 0),
                 "file_updated": datetime.fromtimestamp(
-                    os.path.getmtime(combined_path)
+                    COMBINED_PATH.stat().st_mtime
                 ).isoformat()
             }
             result["sources"].append({"name": "combined/latest.json", "status": "loaded"})
@@ -189,6 +308,16 @@ async def refresh_data():
 # Routes - Orders
 # ─────────────────────────────────────────────────────────────
 
+# Real-mode order fetches keyed by (start, end, channel); dashboard clients
+# polling within the TTL share one round of platform API calls
+ORDERS_CACHE_TTL = 30.0
+
+# Window fetched when no start_date is given, so a plain dashboard request
+# doesn't page through the merchant's whole order history
+DEFAULT_ORDERS_WINDOW = timedelta(days=7)
+_orders_cache: TTLCache = TTLCache(maxsize=64, ttl=ORDERS_CACHE_TTL)
+
+
 @app.get("/api/orders", response_model=List[Order])
 async def get_orders(
     channel: Optional[Channel] = Query(None, description="Filter by channel"),
@@ -202,39 +331,54 @@ async def get_orders(
     
     - **channel**: cafe24, naver, or coupang
     - **status**: pending, confirmed, processing, shipped, delivered, cancelled, returned
-    - **start_date**: Filter orders from this date
+    - **start_date**: Filter orders from this date (default: 7 days before end_date or today)
     - **end_date**: Filter orders until this date
     """
     if config.use_mock_data:
-        return mock_service.get_orders(channel=channel, status=status)[:limit]
+        return mock_orders_response(
+            mock_service.get_orders(channel=channel, status=status, limit=limit)
+        )
     
-    # Real implementation would aggregate from all platforms
-    orders = []
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        end = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    if start is None:
+        # Day-aligned so repeated requests share a cache key
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        start = (end or today) - DEFAULT_ORDERS_WINDOW
     
-    if channel is None or channel == Channel.CAFE24:
-        # orders.extend(await cafe24_client.get_orders(...))
-        pass
+    # Query the platforms concurrently; status codes differ per platform,
+    # so the status filter is applied to the normalized orders
+    cache_key = (start, end, channel)
+    orders = _orders_cache.get(cache_key)
+    if orders is None:
+        orders, failed = await fetch_all_orders(
+            start_date=start,
+            end_date=end,
+            channels=[channel] if channel else None
+        )
+        # A partial list from a platform outage is served but not cached,
+        # so the next request retries the failed platforms
+        if not failed:
+            _orders_cache[cache_key] = orders
+    if status:
+        orders = [o for o in orders if o.status == status]
     
-    if channel is None or channel == Channel.NAVER:
-        # orders.extend(await naver_client.get_orders(...))
-        pass
-    
-    if channel is None or channel == Channel.COUPANG:
-        # orders.extend(await coupang_client.get_orders(...))
-        pass
-    
-    return orders[:limit]
+    return heapq.nlargest(limit, orders, key=attrgetter("ordered_at"))
 
 
 @app.get("/api/orders/{order_id}", response_model=Order)
 async def get_order(order_id: str):
     """Get a specific order by ID"""
     if config.use_mock_data:
-        orders = mock_service.get_orders()
-        for order in orders:
-            if order.order_id == order_id:
-                return order
-        raise HTTPException(status_code=404, detail="Order not found")
+        order = mock_service.get_order(order_id)
+        if order is None:
+            raise HTTPException(status_code=404, detail="Order not found")
+        return Response(
+            content=app.state.mock_orders[order_id], media_type="application/json"
+        )
     
     # Determine channel from order_id prefix and fetch from appropriate platform
     raise HTTPException(status_code=404, detail="Order not found")
@@ -307,10 +451,10 @@ async def get_shipping_status():
 async def get_order_shipping(order_id: str):
     """Get shipping status for a specific order"""
     if config.use_mock_data:
-        shipping_list = mock_service.get_shipping_status(order_id)
-        if shipping_list:
-            return shipping_list[0]
-        raise HTTPException(status_code=404, detail="Shipping info not found")
+        shipping = mock_service.get_order_shipping(order_id)
+        if shipping is None:
+            raise HTTPException(status_code=404, detail="Shipping info not found")
+        return shipping
     
     raise HTTPException(status_code=404, detail="Shipping info not found")
 
@@ -337,8 +481,7 @@ async def update_shipping(
 async def get_weekly_analytics():
     """Get weekly sales analytics"""
     if config.use_mock_data:
-        dashboard = mock_service.get_dashboard_data()
-        return dashboard.weekly_sales
+        return mock_dashboard_response("weekly_sales")
     
     return []
 
@@ -347,8 +490,7 @@ async def get_weekly_analytics():
 async def get_channel_analytics():
     """Get channel breakdown analytics"""
     if config.use_mock_data:
-        dashboard = mock_service.get_dashboard_data()
-        return dashboard.channel_breakdown
+        return mock_dashboard_response("channel_breakdown")
     
     return []
 
@@ -359,9 +501,15 @@ async def get_channel_analytics():
 
 if __name__ == "__main__":
     import uvicorn
+    
+    # Real mode stays on one worker: the per-platform rate limiters and the
+    # orders cache live in-process, so N workers would multiply the API
+    # quotas by N. Mock mode has no such state and can use every CPU.
+    workers = 1 if config.debug or not config.use_mock_data else (os.cpu_count() or 1)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=config.debug
+        reload=config.debug,
+        workers=workers
     )
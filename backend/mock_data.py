@@ -4,7 +4,8 @@ Replace with real API calls when integrations are ready.
 """
 
 from datetime import datetime, timedelta
-from typing import List
+from operator import attrgetter
+from typing import Dict, List, Optional
 import random
 
 from models import (
@@ -36,33 +37,53 @@ CUSTOMER_NAMES = [
     "강하은", "조민서", "윤서진", "임도윤", "한지우"
 ]
 
+PAYMENT_METHODS = ("카드결제", "무통장입금", "카카오페이", "네이버페이")
+CARRIERS = ("CJ대한통운", "한진택배", "롯데택배", "우체국택배")
+
+_ALL_CHANNELS = tuple(Channel)
+_ALL_ORDER_STATUSES = tuple(OrderStatus)
+_ALL_SHIPPING_STATUSES = tuple(ShippingStatus)
+
 
 class MockDataService:
     """Mock data service for development"""
     
     def __init__(self):
         self.base_date = datetime.now()
+        self._orders = self._build_orders()
+        self._orders.sort(key=attrgetter("ordered_at"), reverse=True)
+        self._orders_by_id = {o.order_id: o for o in self._orders}
+        self._shipping = self._build_shipping()
+        self._shipping_by_id = {sh.order_id: sh for sh in self._shipping}
+        self._pending_shipments = self._build_pending_shipments()
+        self._inventory = self._build_inventory()
+        
+        # Per-channel / per-status views, each kept newest first
+        self._by_channel: Dict[Channel, List[Order]] = {}
+        self._by_status: Dict[OrderStatus, List[Order]] = {}
+        for o in self._orders:
+            self._by_channel.setdefault(o.channel, []).append(o)
+            self._by_status.setdefault(o.status, []).append(o)
     
     # ─────────────────────────────────────────────────────────
     # Orders
     # ─────────────────────────────────────────────────────────
     
-    def get_orders(self, channel: Channel = None, status: OrderStatus = None) -> List[Order]:
-        """Generate mock orders"""
+    def _build_orders(self) -> List[Order]:
+        """Generate the mock order book once per service instance"""
+        rng = random.Random(self.base_date.toordinal())
         orders = []
-        channels = [channel] if channel else list(Channel)
         
         for i in range(30):
-            ch = random.choice(channels) if not channel else channel
-            order_status = status if status else random.choice(list(OrderStatus))
+            ch = rng.choice(_ALL_CHANNELS)
+            order_status = rng.choice(_ALL_ORDER_STATUSES)
             
-            num_items = random.randint(1, 3)
+            num_items = rng.randint(1, 3)
             items = []
             total = 0
             
-            for _ in range(num_items):
-                product = random.choice(PRODUCTS)
-                qty = random.randint(1, 3)
+            for product in rng.choices(PRODUCTS, k=num_items):
+                qty = rng.randint(1, 3)
                 item_total = product["price"] * qty
                 total += item_total
                 
@@ -78,17 +99,44 @@ class MockDataService:
                 order_id=f"{ch.value.upper()}-{self.base_date.strftime('%Y%m%d')}-{i+1:04d}",
                 channel=ch,
                 status=order_status,
-                customer_name=random.choice(CUSTOMER_NAMES),
-                customer_phone=f"010-{random.randint(1000,9999)}-{random.randint(1000,9999)}",
+                customer_name=rng.choice(CUSTOMER_NAMES),
+                customer_phone=f"010-{rng.randint(1000,9999)}-{rng.randint(1000,9999)}",
                 items=items,
                 total_amount=total,
                 shipping_fee=3000 if total < 50000 else 0,
-                payment_method=random.choice(["카드결제", "무통장입금", "카카오페이", "네이버페이"]),
-                ordered_at=self.base_date - timedelta(hours=random.randint(0, 72)),
+                payment_method=rng.choice(PAYMENT_METHODS),
+                ordered_at=self.base_date - timedelta(hours=rng.randint(0, 72)),
                 shipping_address="서울시 강남구 테헤란로 123"
             ))
         
-        return sorted(orders, key=lambda x: x.ordered_at, reverse=True)
+        return orders
+    
+    def get_orders(
+        self,
+        channel: Channel = None,
+        status: OrderStatus = None,
+        limit: int = None
+    ) -> List[Order]:
+        """Get mock orders, newest first"""
+        if channel is None and status is None:
+            return self._orders[:limit]
+        if status is None:
+            return self._by_channel.get(channel, [])[:limit]
+        if channel is None:
+            return self._by_status.get(status, [])[:limit]
+        
+        # Both filters: scan the smaller index for the other attribute
+        by_channel = self._by_channel.get(channel, [])
+        by_status = self._by_status.get(status, [])
+        if len(by_channel) <= len(by_status):
+            matches = [o for o in by_channel if o.status == status]
+        else:
+            matches = [o for o in by_status if o.channel == channel]
+        return matches[:limit]
+    
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Look up a single mock order by ID"""
+        return self._orders_by_id.get(order_id)
     
     def get_today_orders(self) -> List[Order]:
         """Get today's orders only"""
@@ -99,8 +147,8 @@ class MockDataService:
     # Pending Shipments
     # ─────────────────────────────────────────────────────────
     
-    def get_pending_shipments(self) -> List[PendingShipment]:
-        """Get orders pending shipment"""
+    def _build_pending_shipments(self) -> List[PendingShipment]:
+        """Generate mock pending shipments once per service instance"""
         shipments = []
         
         pending_data = [
@@ -126,12 +174,17 @@ class MockDataService:
         
         return shipments
     
+    def get_pending_shipments(self) -> List[PendingShipment]:
+        """Get orders pending shipment"""
+        return list(self._pending_shipments)
+    
     # ─────────────────────────────────────────────────────────
     # Inventory
     # ─────────────────────────────────────────────────────────
     
-    def get_inventory(self) -> List[InventoryItem]:
-        """Get inventory status"""
+    def _build_inventory(self) -> List[InventoryItem]:
+        """Generate mock inventory once per service instance"""
+        rng = random.Random(self.base_date.toordinal())
         inventory = []
         
         stock_levels = [
@@ -158,37 +211,50 @@ class MockDataService:
                 available_stock=available,
                 status=status,
                 low_stock_threshold=10,
-                last_updated=self.base_date - timedelta(minutes=random.randint(5, 120))
+                last_updated=self.base_date - timedelta(minutes=rng.randint(5, 120))
             ))
         
         return inventory
     
+    def get_inventory(self) -> List[InventoryItem]:
+        """Get inventory status"""
+        return list(self._inventory)
+    
     # ─────────────────────────────────────────────────────────
     # Shipping
     # ─────────────────────────────────────────────────────────
     
-    def get_shipping_status(self, order_id: str = None) -> List[ShippingInfo]:
-        """Get shipping information"""
-        carriers = ["CJ대한통운", "한진택배", "롯데택배", "우체국택배"]
+    def _build_shipping(self) -> List[ShippingInfo]:
+        """Generate mock shipping records once per service instance"""
+        rng = random.Random(self.base_date.toordinal())
         
         shipping_list = []
         for i in range(10):
-            status = random.choice(list(ShippingStatus))
-            shipped_at = self.base_date - timedelta(days=random.randint(1, 5)) if status != ShippingStatus.PENDING else None
+            status = rng.choice(_ALL_SHIPPING_STATUSES)
+            shipped_at = self.base_date - timedelta(days=rng.randint(1, 5)) if status != ShippingStatus.PENDING else None
             
             shipping_list.append(ShippingInfo(
                 order_id=f"ORD-{i+1:04d}",
-                tracking_number=f"{random.randint(100000000000, 999999999999)}" if shipped_at else None,
-                carrier=random.choice(carriers) if shipped_at else None,
+                tracking_number=f"{rng.randint(100000000000, 999999999999)}" if shipped_at else None,
+                carrier=rng.choice(CARRIERS) if shipped_at else None,
                 status=status,
                 shipped_at=shipped_at,
                 estimated_delivery=shipped_at + timedelta(days=2) if shipped_at else None
             ))
         
-        if order_id:
-            return [s for s in shipping_list if s.order_id == order_id]
         return shipping_list
     
+    def get_shipping_status(self, order_id: str = None) -> List[ShippingInfo]:
+        """Get shipping information"""
+        if order_id:
+            shipping = self._shipping_by_id.get(order_id)
+            return [shipping] if shipping else []
+        return list(self._shipping)
+    
+    def get_order_shipping(self, order_id: str) -> Optional[ShippingInfo]:
+        """Look up shipping information for a single order"""
+        return self._shipping_by_id.get(order_id)
+    
     # ─────────────────────────────────────────────────────────
     # Dashboard Summary
     # ─────────────────────────────────────────────────────────
@@ -213,20 +279,17 @@ class MockDataService:
         ]
         
         # Weekly Sales (last 7 days)
-        weekly_sales = []
-        for i in range(6, -1, -1):
-            date = self.base_date - timedelta(days=i)
-            cafe24 = random.randint(800_000, 2_000_000)
-            naver = random.randint(1_000_000, 2_500_000)
-            coupang = random.randint(700_000, 1_800_000)
-            
-            weekly_sales.append(WeeklySales(
-                date=date.strftime("%m/%d"),
-                cafe24=cafe24,
-                naver=naver,
-                coupang=coupang,
+        randint = random.randint
+        weekly_sales = [
+            WeeklySales(
+                date=(self.base_date - timedelta(days=i)).strftime("%m/%d"),
+                cafe24=(cafe24 := randint(800_000, 2_000_000)),
+                naver=(naver := randint(1_000_000, 2_500_000)),
+                coupang=(coupang := randint(700_000, 1_800_000)),
                 total=cafe24 + naver + coupang
-            ))
+            )
+            for i in range(6, -1, -1)
+        ]
         
         return DashboardData(
             summary=summary,
@@ -0,0 +1,96 @@
+"""
+Real-mode /api/orders against mocked platform APIs
+
+Run from backend/:  python -m unittest discover tests
+"""
+
+import os
+import unittest
+from unittest import mock
+
+# Credentials must be in place before config and the clients are imported
+os.environ.update(
+    USE_MOCK_DATA="false",
+    CAFE24_CLIENT_ID="id", CAFE24_CLIENT_SECRET="secret",
+    CAFE24_ACCESS_TOKEN="token", CAFE24_MALL_ID="mall",
+    NAVER_CLIENT_ID="id", NAVER_CLIENT_SECRET="secret",
+    COUPANG_VENDOR_ID="vendor", COUPANG_ACCESS_KEY="access", COUPANG_SECRET_KEY="secret",
+)
+
+import httpx
+from fastapi.testclient import TestClient
+
+import main
+
+# One order per platform, in each platform's own timestamp format:
+# Cafe24 sends an offset, Naver sends UTC, Coupang sends naive Korea time
+CAFE24_ORDERS = {"total_count": 1, "orders": [
+    {"order_id": "cafe24-1", "order_date": "2026-10-12T11:00:00+09:00"}
+]}
+NAVER_ORDERS = {"data": {"totalElements": 1, "contents": [
+    {"orderId": "naver-1", "orderDate": "2026-10-12T01:30:00Z"}
+]}}
+COUPANG_ORDERS = {"data": [
+    {"orderId": 1, "orderedAt": "2026-10-12T10:00:00"}
+]}
+
+
+# Paths answered with a 503, to simulate a platform outage
+FAILING_PATHS = set()
+
+
+def platform_api(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if any(path.endswith(failing) for failing in FAILING_PATHS):
+        return httpx.Response(503)
+    if path.endswith("/admin/orders"):
+        return httpx.Response(200, json=CAFE24_ORDERS)
+    if path.endswith("/orders/search"):
+        return httpx.Response(200, json=NAVER_ORDERS)
+    if path.endswith("/ordersheets"):
+        return httpx.Response(200, json=COUPANG_ORDERS)
+    return httpx.Response(200)
+
+
+class RealModeOrdersTest(unittest.TestCase):
+
+    def setUp(self):
+        main._orders_cache.clear()
+        FAILING_PATHS.clear()
+        transport = mock.patch.object(
+            main, "create_transport", lambda: httpx.MockTransport(platform_api)
+        )
+        transport.start()
+        self.addCleanup(transport.stop)
+        self.client = self.enterContext(TestClient(main.app))
+
+    def test_mixed_platforms_sorted_newest_first(self):
+        response = self.client.get("/api/orders")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [order["order_id"] for order in response.json()],
+            ["cafe24-1", "naver-1", "1"]
+        )
+
+    def test_single_platform(self):
+        response = self.client.get("/api/orders", params={"channel": "coupang"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([order["order_id"] for order in response.json()], ["1"])
+
+    def test_platform_outage_not_cached(self):
+        FAILING_PATHS.add("/orders/search")
+        response = self.client.get("/api/orders")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [order["order_id"] for order in response.json()], ["cafe24-1", "1"]
+        )
+        self.assertEqual(len(main._orders_cache), 0)
+
+        FAILING_PATHS.clear()
+        response = self.client.get("/api/orders")
+        self.assertEqual(len(response.json()), 3)
+        self.assertEqual(len(main._orders_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,15 @@ Cafe24 Data Scraper
 Scrapes order data from Cafe24 admin pages via browser automation
 """
 
-import json
+import orjson
+import os
 import asyncio
+import itertools
 import aiohttp
 import websockets
 from datetime import datetime
 from pathlib import Path
+from typing import Container, List, Optional, Tuple
 
 DATA_DIR = Path(__file__).parent.parent
 CDP_URL = "http://127.0.0.1:18800"
@@ -18,54 +21,102 @@ CDP_URL = "http://127.0.0.1:18800"
 # CDP Helpers
 # ═══════════════════════════════════════════════════════════════
 
-async def get_tabs():
+async def get_tabs(session: aiohttp.ClientSession):
     """Get all browser tabs"""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f"{CDP_URL}/json") as resp:
-            return await resp.json()
+    async with session.get(f"{CDP_URL}/json") as resp:
+        return await resp.json()
 
-async def find_cafe24_tab():
-    """Find Cafe24 admin tab"""
-    tabs = await get_tabs()
+async def find_cafe24_tab(session: aiohttp.ClientSession, tabs: Optional[list] = None):
+    """Find Cafe24 admin tab, fetching the tab list unless one is given"""
+    if tabs is None:
+        tabs = await get_tabs(session)
     for tab in tabs:
         url = tab.get("url", "")
         if "cafe24.com/admin" in url and tab.get("type") == "page":
             return tab
     return None
 
-async def execute_script(ws_url: str, script: str):
-    """Execute JavaScript in browser tab"""
-    async with websockets.connect(ws_url) as ws:
-        msg_id = 1
-        
-        # Enable Runtime
-        await ws.send(json.dumps({
-            "id": msg_id,
-            "method": "Runtime.enable"
-        }))
-        await ws.recv()
-        msg_id += 1
-        
-        # Execute script
-        await ws.send(json.dumps({
+# CDP message ids; replies are matched to commands by id
+_message_ids = itertools.count(1)
+
+async def _recv_reply(ws, wanted: Container[int]) -> Tuple[int, dict]:
+    """
+    Receive messages until a reply to one of the `wanted` ids arrives
+
+    CDP interleaves events (console output, context changes) with the
+    replies; those are skipped. Every frame gets a single orjson parse:
+    peeking at ids with a lazy parser first measured slower for both
+    small events and large replies.
+    """
+    while True:
+        reply = orjson.loads(await ws.recv())
+        if reply.get("id") in wanted:
+            return reply["id"], reply
+
+async def send_commands(ws, commands: List[Tuple[str, Optional[dict]]]) -> List[dict]:
+    """
+    Send several CDP commands back-to-back and wait for all their replies
+
+    CDP runs a connection's commands in order, so pipelining them costs a
+    single round trip. Replies are returned in command order.
+    """
+    msg_ids = []
+    for method, params in commands:
+        msg_id = next(_message_ids)
+        msg_ids.append(msg_id)
+        await ws.send(orjson.dumps({
             "id": msg_id,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": script,
-                "returnByValue": True,
-                "awaitPromise": True
-            }
-        }))
-        
-        result = json.loads(await ws.recv())
-        return result.get("result", {}).get("result", {}).get("value")
+            "method": method,
+            "params": params or {}
+        }).decode())  # CDP expects text frames
+    
+    replies = {}
+    while len(replies) < len(msg_ids):
+        msg_id, reply = await _recv_reply(ws, set(msg_ids) - replies.keys())
+        replies[msg_id] = reply
+    return [replies[msg_id] for msg_id in msg_ids]
+
+def _evaluate_params(script: str) -> dict:
+    """Runtime.evaluate params returning the script's value as JSON"""
+    return {
+        "expression": script,
+        "returnByValue": True,
+        "awaitPromise": True
+    }
+
+def _result_value(reply: dict):
+    """Pull the evaluated value out of a Runtime reply"""
+    return reply.get("result", {}).get("result", {}).get("value")
+
+def _load_rows(raw: Optional[str]) -> list:
+    """Decode a row list the scrape scripts return pre-stringified"""
+    return orjson.loads(raw) if raw else []
 
 # ═══════════════════════════════════════════════════════════════
 # Scraping Scripts
 # ═══════════════════════════════════════════════════════════════
 
+# Each script runs once per connection, so they are sent with
+# Runtime.evaluate rather than compileScript + runScript: precompiling
+# would add a round trip to save V8 parsing a few KB of source.
+#
+# Row lists are returned as JSON.stringify output: CDP then ships one
+# string instead of walking and re-serializing the object tree.
+
+# Digit extraction shared by the scripts: one pass over the text instead of
+# a regex replace + parseInt per cell
+_DIGITS_JS = """
+    const digits = (el) => {
+        let n = 0;
+        for (const c of el.textContent) {
+            if (c >= '0' && c <= '9') n = n * 10 + (c.charCodeAt(0) - 48);
+        }
+        return n;
+    };
+"""
+
 SCRAPE_DASHBOARD_SCRIPT = """
-(function() {
+(function() {""" + _DIGITS_JS + """
     // Try to scrape from dashboard
     const result = {
         total_orders: 0,
@@ -76,19 +127,19 @@ SCRAPE_DASHBOARD_SCRIPT = """
     // Find pending shipments count
     const pendingEl = document.querySelector('[class*="shipping"] [class*="count"], .shipped_begin_count, a[href*="shipped_begin"] strong');
     if (pendingEl) {
-        result.pending_shipments = parseInt(pendingEl.textContent.replace(/[^0-9]/g, '')) || 0;
+        result.pending_shipments = digits(pendingEl);
     }
     
     // Find today's orders
     const ordersEl = document.querySelector('.today-order-count, [class*="order"] [class*="count"]');
     if (ordersEl) {
-        result.total_orders = parseInt(ordersEl.textContent.replace(/[^0-9]/g, '')) || 0;
+        result.total_orders = digits(ordersEl);
     }
     
     // Find revenue
     const revenueEl = document.querySelector('.today-sales, [class*="revenue"], [class*="sales"]');
     if (revenueEl) {
-        result.total_revenue = parseInt(revenueEl.textContent.replace(/[^0-9]/g, '')) || 0;
+        result.total_revenue = digits(revenueEl);
     }
     
     return result;
@@ -96,7 +147,7 @@ SCRAPE_DASHBOARD_SCRIPT = """
 """
 
 SCRAPE_ORDERS_SCRIPT = """
-(function() {
+(function() {""" + _DIGITS_JS + """
     const orders = [];
     
     // Find order table rows
@@ -105,7 +156,7 @@ SCRAPE_ORDERS_SCRIPT = """
     rows.forEach((row, idx) => {
         if (idx > 50) return; // Limit
         
-        const cells = row.querySelectorAll('td');
+        const cells = row.cells;
         if (cells.length < 3) return;
         
         // Try to extract order data
@@ -119,7 +170,7 @@ SCRAPE_ORDERS_SCRIPT = """
             order_id: orderIdEl ? orderIdEl.textContent.trim() : '',
             status: statusEl ? statusEl.textContent.trim() : '',
             customer_name: customerEl ? customerEl.textContent.trim() : '',
-            total_amount: amountEl ? parseInt(amountEl.textContent.replace(/[^0-9]/g, '')) || 0 : 0,
+            total_amount: amountEl ? digits(amountEl) : 0,
             ordered_at: dateEl ? dateEl.textContent.trim() : '',
             channel: 'cafe24'
         };
@@ -129,12 +180,12 @@ SCRAPE_ORDERS_SCRIPT = """
         }
     });
     
-    return orders;
+    return JSON.stringify(orders);
 })()
 """
 
 SCRAPE_PENDING_SCRIPT = """
-(function() {
+(function() {""" + _DIGITS_JS + """
     const orders = [];
     
     // On shipped_begin_list page
@@ -143,14 +194,14 @@ SCRAPE_PENDING_SCRIPT = """
     rows.forEach((row, idx) => {
         if (idx > 30) return;
         
-        const cells = row.querySelectorAll('td');
+        const cells = row.cells;
         if (cells.length < 5) return;
         
         // Extract from Cafe24 배송준비중 table
         const orderIdLink = row.querySelector('a[href*="order_id"], td a');
         const productEl = row.querySelector('[class*="product"], td:nth-child(9) a, td:nth-child(10) a');
-        const customerEl = row.querySelector('td:nth-child(4) a');
-        const dateEl = row.querySelector('td:nth-child(2)');
+        const customerEl = cells[3].querySelector('a');
+        const dateEl = cells[1];
         const amountEl = row.querySelector('[class*="price"], td:nth-child(14)');
         
         const order = {
@@ -158,7 +209,7 @@ SCRAPE_PENDING_SCRIPT = """
             product_name: productEl ? productEl.textContent.trim().substring(0, 50) : '',
             customer_name: customerEl ? customerEl.textContent.trim() : '',
             ordered_at: dateEl ? dateEl.textContent.trim().split('(')[0] : '',
-            total_amount: amountEl ? parseInt(amountEl.textContent.replace(/[^0-9]/g, '')) || 0 : 0,
+            total_amount: amountEl ? digits(amountEl) : 0,
             quantity: 1,
             channel: 'cafe24',
             status: 'processing'
@@ -169,19 +220,38 @@ SCRAPE_PENDING_SCRIPT = """
         }
     });
     
-    return orders;
+    return JSON.stringify(orders);
 })()
 """
 
+def _save(path: Path, obj):
+    """Write `obj` as compact JSON via a temp file, replacing `path` atomically"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(orjson.dumps(obj))
+    os.replace(tmp, path)
+
 # ═══════════════════════════════════════════════════════════════
 # Main Collector
 # ═══════════════════════════════════════════════════════════════
 
-async def collect():
-    """Collect data from Cafe24"""
+async def collect(
+    session: Optional[aiohttp.ClientSession] = None,
+    tabs: Optional[list] = None
+):
+    """
+    Collect data from Cafe24
+
+    Pass the caller's session (and tab listing, if already fetched) to
+    reuse its CDP connection; otherwise a session is opened just for
+    this run.
+    """
     print("📦 Cafe24 Scraper")
     
-    tab = await find_cafe24_tab()
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await collect(session, tabs)
+    
+    tab = await find_cafe24_tab(session, tabs)
     if not tab:
         print("  ❌ No Cafe24 admin tab found")
         return None
@@ -206,20 +276,31 @@ async def collect():
     
     try:
         # Check if we're on the pending shipments page
-        if "shipped_begin" in tab.get("url", ""):
+        on_pending_page = "shipped_begin" in tab.get("url", "")
+        if on_pending_page:
             print("  📋 Scraping pending shipments page...")
-            orders = await execute_script(ws_url, SCRAPE_PENDING_SCRIPT)
+            script = SCRAPE_PENDING_SCRIPT
+        else:
+            print("  📊 Scraping dashboard...")
+            script = SCRAPE_DASHBOARD_SCRIPT
+        
+        # One connection; Runtime.enable and the scrape are pipelined
+        async with websockets.connect(ws_url, max_size=2**22) as ws:
+            _, evaluated = await send_commands(ws, [
+                ("Runtime.enable", None),
+                ("Runtime.evaluate", _evaluate_params(script))
+            ])
+        value = _result_value(evaluated)
+        
+        if on_pending_page:
+            orders = _load_rows(value)
             if orders:
                 data["orders"] = orders
                 data["summary"]["pending_shipments"] = len(orders)
                 print(f"  ✓ Found {len(orders)} pending orders")
-        else:
-            # Try dashboard scraping
-            print("  📊 Scraping dashboard...")
-            summary = await execute_script(ws_url, SCRAPE_DASHBOARD_SCRIPT)
-            if summary:
-                data["summary"] = summary
-                print(f"  ✓ Dashboard: {summary}")
+        elif value:
+            data["summary"] = value
+            print(f"  ✓ Dashboard: {value}")
     
     except Exception as e:
         print(f"  ❌ Error: {e}")
@@ -229,11 +310,15 @@ async def collect():
     output_dir.mkdir(exist_ok=True)
     
     output_file = output_dir / "orders.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    await asyncio.to_thread(_save, output_file, data)
     
     print(f"  ✓ Saved to {output_file}")
     return data
 
 if __name__ == "__main__":
-    asyncio.run(collect())
+    try:
+        import uvloop  # optional, faster event loop
+    except ImportError:
+        asyncio.run(collect())
+    else:
+        uvloop.run(collect())